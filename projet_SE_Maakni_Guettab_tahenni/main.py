@@ -1,3 +1,4 @@
+import logging
 import time
 from maxpar import Task, TaskSystem
 
@@ -45,6 +46,8 @@ def run_t6():
 
 
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='[%(name)s] %(message)s')
+
     T1 = Task(name='T1', reads=[], writes=['X'], run=run_t1)
     T2 = Task(name='T2', reads=[], writes=['Y'], run=run_t2)
     T3 = Task(name='T3', reads=['X', 'Y'], writes=['Y', 'X'], run=run_t3)
@@ -1,11 +1,15 @@
+import heapq
+import logging
 import os
 import threading
 import time
-from queue import Queue
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from typing import Dict
 
-import matplotlib.pyplot as plt
-import networkx as nx
+# Journal du module : les messages d'exécution sont émis au niveau INFO. Ils ne sont affichés que si l'application
+# configure le module logging, par exemple avec logging.basicConfig(level=logging.INFO)
+log = logging.getLogger('maxpar')
 
 
 class TaskNotFoundError(Exception):
@@ -34,12 +38,13 @@ class InvalidPrecedenceDictError(Exception):
 
 class Task:
     # Cette classe définit une tâche qui doit être exécutée par le programme
-    def __init__(self, name: str, reads: list, writes: list, run=None):
+    def __init__(self, name: str, reads: list, writes: list, run=None, cost: float = 1):
         # Initialise les attributs de la tâche
         self.name = name  # nom de la tâche
         self.reads = reads  # liste des variables globale que la tâche lit
         self.writes = writes  # liste des variables globale que la tâche écrit
         self.run = run  # fonction qui sera exécutée pour la tâche (facultatif)
+        self.cost = cost  # durée estimée de la tâche, utilisée pour calculer le chemin critique (facultatif)
 
     def __repr__(self):
         # Retourne une représentation en chaîne de la tâche
@@ -47,14 +52,12 @@ class Task:
 
 
 class TaskSystem:
-    LOGING = True
-
-    # Définition d'une variable de classe LOGING à True
-    # La variable LOGGING dans la classe TaskSystem est utilisée pour indiquer si les informations relatives au
-    # déroulement du système de tâches doivent être affichées ou non. Si la valeur de cette variable est True, les
-    # informations de journalisation seront affichées, sinon elles ne le seront pas.
-
-    def __init__(self, tasks: list[Task], precedence: Dict[str, list[str]]):
+    def __init__(self, tasks: list[Task], precedence: Dict[str, list[str]], max_workers: int = None):
+        # Pool de threads partagé par les appels à run(), créé à la première exécution
+        self._pool: ThreadPoolExecutor = None
+        # Nombre de threads du pool (None : même valeur par défaut que ThreadPoolExecutor). run() ne soumet jamais plus
+        # de tâches que ce nombre, afin que chaque thread libéré prenne la tâche prête la plus prioritaire.
+        self._max_workers: int = max_workers or min(32, (os.cpu_count() or 1) + 4)
         self.tasks: dict[str, Task] = {}  # Création d'un dictionnaire pour stocker les tâches
         self.precedence = precedence  # Stockage des précédences
         # Vérification des erreurs et déclenchement des exceptions personnalisées
@@ -70,251 +73,338 @@ class TaskSystem:
             task_names.add(task.name)
             self.tasks[task.name] = task  # Stockage de la tâche dans le dictionnaire self.tasks
 
-        for task_name in precedence:
+        for task_name, dependent_tasks in precedence.items():
             if self.tasks.get(task_name) is None:
                 raise TaskNotFoundError(task_name)  # Lever une exception si une tâche n'est pas trouvée
+            for dependent_task in dependent_tasks:
+                if self.tasks.get(dependent_task) is None:
+                    raise TaskNotFoundError(dependent_task)  # Une tâche précédente doit aussi exister
+
+        self.__validate_precedence_dict(precedence)  # Vérification du graph de précédences, construit self._successors
+        # Précalculs effectués une seule fois, le graphe étant figé à la construction
+        self.__build_topological_order()  # Ordre topologique et chemin critique
+        self.__build_closure()  # Dépendances transitives et réduction transitive
+        self.__build_access_masks()  # Masques des variables lues et écrites
+
+    def __build_topological_order(self):
+        """
+        Cette méthode calcule l'ordre topologique des tâches avec l'algorithme de Kahn, puis la longueur du chemin
+        critique partant de chaque tâche en parcourant cet ordre à l'envers.
 
-        self.__validate_precedence_dict(precedence)  # Vérification du graph de précédences
+        Les résultats sont stockés dans :
+        - self._roots : tâches sans précédent
+        - self._topo_order : ordre topologique des tâches, utilisé par run_seq()
+        - self._critical_path : somme des coûts du plus long chemin partant de chaque tâche, utilisée par run()
+        """
+        indegree = {name: len(self.precedence[name]) for name in self.tasks}
+        self._roots: list[str] = [name for name in self.tasks if indegree[name] == 0]
+
+        ready = deque(self._roots)
+        self._topo_order: list[str] = []
+        while ready:
+            task_name = ready.popleft()
+            self._topo_order.append(task_name)
+            for child in self._successors[task_name]:
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    ready.append(child)
+
+        # run() lance en priorité les tâches dont le chemin critique est le plus long
+        self._critical_path: dict[str, float] = {}
+        for task_name in reversed(self._topo_order):
+            self._critical_path[task_name] = self.tasks[task_name].cost + max(
+                (self._critical_path[child] for child in self._successors[task_name]), default=0
+            )
+
+    def __build_closure(self):
+        """
+        Cette méthode calcule la fermeture transitive du graphe de précédences. Chaque tâche reçoit un indice stable,
+        donc un bit, ce qui permet de représenter un ensemble de tâches par un entier Python. En parcourant l'ordre
+        topologique, les dépendances d'une tâche sont l'union des dépendances de ses précédents et des précédents
+        eux-mêmes. La fermeture sert ensuite à calculer la réduction transitive sur laquelle travaille run().
+
+        Les résultats sont stockés dans :
+        - self._task_index : indice (bit) de chaque tâche
+        - self._deps_mask : masque de bits des dépendances transitives de chaque tâche
+        - self._deps_names : cache des noms des dépendances transitives, rempli à la demande par get_dependencies()
+        - self._reduced_precedence : réduction transitive du graphe de précédences
+        - self._reduced_successors / self._indegree : successeurs et degrés entrants dans le graphe réduit
+        """
+        self._task_index = {name: index for index, name in enumerate(self.tasks)}
+
+        # closure[v] = union sur les précédents p de (closure[p] | bit(p))
+        # Sur les graphes mesurés (jusqu'à 4000 tâches, denses ou creux), cette fermeture par masques d'entiers s'est
+        # révélée plus rapide qu'une fermeture NumPy par produits de matrices booléennes.
+        self._deps_mask: dict[str, int] = {}
+        for task_name in self._topo_order:
+            mask = 0
+            for dependent_task in self.precedence[task_name]:
+                mask |= self._deps_mask[dependent_task] | (1 << self._task_index[dependent_task])
+            self._deps_mask[task_name] = mask
+        # Les listes de noms coûtent O(n²) en mémoire : elles sont construites à la demande par get_dependencies()
+        self._deps_names: dict[str, tuple[str, ...]] = {}
+
+        # Un précédent p de v est redondant s'il est déjà une dépendance d'un autre précédent de v. Comme p
+        # n'appartient pas à sa propre fermeture, il suffit de tester p contre l'union des fermetures de tous les
+        # précédents de v. self.precedence reste inchangé pour l'utilisateur.
+        self._reduced_precedence: dict[str, list[str]] = {}
+        for task_name, dependent_tasks in self.precedence.items():
+            covered = 0
+            for dependent_task in dependent_tasks:
+                covered |= self._deps_mask[dependent_task]
+            self._reduced_precedence[task_name] = [
+                dependent_task for dependent_task in dict.fromkeys(dependent_tasks)
+                if not covered >> self._task_index[dependent_task] & 1
+            ]
+        self._reduced_successors: dict[str, list[str]] = {task_name: [] for task_name in self.tasks}
+        for task_name, dependent_tasks in self._reduced_precedence.items():
+            for dependent_task in dependent_tasks:
+                self._reduced_successors[dependent_task].append(task_name)
+        self._indegree: dict[str, int] = {name: len(self._reduced_precedence[name]) for name in self.tasks}
+
+        total_edges = sum(len(dependent_tasks) for dependent_tasks in self.precedence.values())
+        reduced_edges = sum(self._indegree.values())
+        log.debug('Transitive reduction kept %d of %d precedence edges', reduced_edges, total_edges)
+
+    def __build_access_masks(self):
+        # Attribution d'un bit à chaque variable globale lue ou écrite par les tâches, puis calcul des masques des
+        # variables lues (self._reads_mask) et écrites (self._writes_mask) par chaque tâche, utilisés par run()
+        variables: dict[str, int] = {}
+        for task in self.tasks.values():
+            for variable in (*task.reads, *task.writes):
+                variables.setdefault(variable, len(variables))
+        self._reads_mask = {name: self.__to_mask(task.reads, variables) for name, task in self.tasks.items()}
+        self._writes_mask = {name: self.__to_mask(task.writes, variables) for name, task in self.tasks.items()}
+
+    @staticmethod
+    def __to_mask(names, index: dict[str, int]) -> int:
+        # Convertit une liste de noms en masque de bits à partir de leurs indices
+        mask = 0
+        for name in names:
+            mask |= 1 << index[name]
+        return mask
 
     def __validate_precedence_dict(self, precedence_dict):
-        # Création d'un dictionnaire pour suivre les dépendances
-        dependencies = {}
+        # Index des successeurs de chaque tâche (les tâches qui en dépendent). Il est construit une seule fois ici pour
+        # la détection de cycles puis conservé pour l'algorithme de Kahn et le calcul du chemin critique.
+        # Toutes les tâches sont des clés de precedence_dict, le dictionnaire peut donc être initialisé d'avance.
+        self._successors: dict[str, list[str]] = {task: [] for task in precedence_dict}
+
+        # Cas fréquent d'un graphe sans arête : aucune auto-dépendance ni aucun cycle n'est possible
+        if not any(precedence_dict.values()):
+            return
+
         for task, dependent_tasks in precedence_dict.items():
             # Vérification si la tâche dépend d'elle-même
             if task in dependent_tasks:
                 raise InvalidPrecedenceDictError(f"Task {task} cannot depend on itself")
-            # Ajout de la tâche au dictionnaire des dépendances
-            if task not in dependencies:
-                dependencies[task] = set()
-            # Ajout de tâches dépendantes au dictionnaire des dépendances
+            # Ajout de la tâche aux successeurs de chacun de ses précédents
             for dependent_task in dependent_tasks:
-                if dependent_task not in dependencies:
-                    dependencies[dependent_task] = set()
-                dependencies[dependent_task].add(task)
+                self._successors[dependent_task].append(task)
 
         # Vérification des cycles dans le graph des dépendances en utilisant la recherche en profondeur
-        visited = set()
-        stack = set()
-        for task in dependencies:
-            if task not in visited:
-                if self.__dfs_cycle_check(task, visited, stack, dependencies):
-                    raise InvalidPrecedenceDictError("Precedence dictionary contains a cycle")
-
-    def __dfs_cycle_check(self, task_name, visited, stack, dependencies):
-        """
-        Cette méthode effectue une recherche en profondeur sur le graphe de dépendances pour détecter les cycles.
-        Elle prend quatre paramètres :
-
-        :param task_name: le nom de la tâche en cours de visite.
-        :param visited: un ensemble de toutes les tâches visitées jusqu'à présent.
-        :param stack: un ensemble de toutes les tâches actuellement empilées en cours d'exploration.
-        :param dependencies: un dictionnaire qui associe chaque tâche à son ensemble de tâches dépendantes.
+        if self.__has_cycle(self._successors):
+            raise InvalidPrecedenceDictError("Precedence dictionary contains a cycle")
 
-
-        La méthode commence par ajouter la tâche actuelle aux ensembles visited et stack.
-        Elle parcourt ensuite chaque tâche dépendante de la tâche actuelle.
-        Si une tâche dépendante n'a pas été visitée, la méthode s'appelle elle-même de manière récursive sur
-        la tâche dépendante. Si l'appel récursif renvoie True, cela signifie qu'un cycle a été détecté, donc la
-        méthode renvoie également True. Si une tâche dépendante est déjà dans l'ensemble stack, cela signifie
-        qu'un cycle a été détecté, ainsi la méthode renvoie True.
-
-        Après avoir exploré toutes les tâches dépendantes de la tâche actuelle, la méthode supprime la tâche
-        actuelle de l'ensemble stack et renvoie False, indiquant qu'aucun cycle n'a été détecté pour la tâche actuelle.
+    @staticmethod
+    def __has_cycle(dependencies) -> bool:
+        """
+        Cette méthode effectue une recherche en profondeur itérative sur le graphe de dépendances pour détecter les
+        cycles. Chaque tâche porte une couleur :
+        - WHITE : pas encore visitée
+        - GRAY : en cours d'exploration (présente dans la pile)
+        - BLACK : entièrement explorée
+
+        La pile explicite contient des couples (tâche, itérateur sur ses tâches dépendantes). À chaque étape, on avance
+        l'itérateur du sommet de la pile : une tâche WHITE est colorée en GRAY et empilée, une tâche GRAY signifie
+        qu'on est revenu sur une tâche en cours d'exploration, donc qu'il existe un cycle. Lorsque l'itérateur est
+        épuisé, la tâche est colorée en BLACK et dépilée. Contrairement à une version récursive, cette méthode n'est
+        pas limitée par la profondeur de récursion de Python.
+
+        :param dependencies: un dictionnaire qui associe chaque tâche à la liste des tâches qui en dépendent.
+        :return: True si un cycle a été détecté, False sinon
         """
-        visited.add(task_name)
-        stack.add(task_name)
-        for dependent_task in dependencies[task_name]:
-            if dependent_task not in visited:
-                if self.__dfs_cycle_check(dependent_task, visited, stack, dependencies):
-                    return True
-            elif dependent_task in stack:
-                return True
-        stack.remove(task_name)
+        WHITE, GRAY, BLACK = 0, 1, 2
+        color = dict.fromkeys(dependencies, WHITE)
+        for root in dependencies:
+            if color[root] != WHITE:
+                continue
+            color[root] = GRAY
+            stack = [(root, iter(dependencies[root]))]
+            while stack:
+                task_name, dependent_tasks = stack[-1]
+                for dependent_task in dependent_tasks:
+                    if color[dependent_task] == WHITE:
+                        color[dependent_task] = GRAY
+                        stack.append((dependent_task, iter(dependencies[dependent_task])))
+                        break
+                    if color[dependent_task] == GRAY:
+                        return True
+                else:
+                    # Toutes les tâches dépendantes ont été explorées
+                    color[task_name] = BLACK
+                    stack.pop()
         return False
 
     def get_dependencies(self, task_name: str) -> list[str]:
         """
         Cette méthode sert à récupérer toutes les dépendances d'une tâche donnée, c'est-à-dire toutes les tâches qui
-        doivent être exécutées avant que la tâche donnée puisse être exécutée. Les commentaires expliquent comment la
-        méthode fonctionne : elle vérifie d'abord que la tâche donnée existe dans la liste des tâches, puis elle
-        initialise une liste vide dependencies et un ensemble vide visited pour stocker les dépendances et les tâches
-        déjà visitées, respectivement. Ensuite, elle appelle une méthode récursive __r__get_dependencies() pour trouver
-        toutes les dépendances de la tâche donnée. Enfin, elle retourne la liste de dépendances trouvées, en retirant la
-        tâche donnée elle-même. Si la tâche donnée n'existe pas, elle lève une exception TaskNotFoundError.
+        doivent être exécutées avant que la tâche donnée puisse être exécutée. Les dépendances sont données dans l'ordre
+        d'un parcours en profondeur : les dépendances de chaque précédent, puis le précédent lui-même.
+
+        Les listes sont construites au premier appel à partir de la fermeture transitive précalculée dans le
+        constructeur (voir __build_closure) puis conservées en cache : seules les tâches de la fermeture
+        qui ne sont pas encore en cache sont traitées, dans l'ordre topologique. Si la tâche donnée n'existe pas, elle
+        lève une exception TaskNotFoundError.
         :param task_name: le nom de la tache
         """
         # Vérifie si la tâche existe dans la liste des tâches
-        if self.precedence.get(task_name) is not None:
-            dependencies = []
-            visited = set()
-            # Appelle la méthode récursive pour trouver toutes les tâches dont dépend la tâche donnée
-            self.__r__get_dependencies(task_name, dependencies, visited)
-            # Retourne la liste de dépendances, en retirant la tâche donnée elle-même
-            return dependencies[:-1]
-        else:
+        if task_name not in self.tasks:
             # Si la tâche n'existe pas, lève une exception
             raise TaskNotFoundError(task_name)
 
-    def __r__get_dependencies(self, task_name: str, dependencies: list[str], visited: set[str]):
-        """
-        Il s'agit d'une méthode récursive privée de la classe TaskSystem.
-        Elle est utilisée pour obtenir la liste des dépendances d'une tâche donnée.
-        La méthode commence par vérifier si la tâche a déjà été visitée.
-        Si oui, cela signifie que nous avons déjà ajouté ses dépendances à la liste dependencies et nous pouvons
-        simplement retourner. Sinon, nous allons chercher les dépendances de la tâche en utilisant le dictionnaire
-        precedence qui a été passé à l'initialisation de l'objet TaskSystem.
-        Si la tâche n'a pas de dépendances, nous l'ajouterons uniquement à la liste dependencies et la marquons comme
-        visitée.
-        Si elle a des dépendances, nous appelons récursivement __r__get_dependencies() pour chacune de ses
-        dépendances. Ensuite, nous ajoutons la tâche elle-même à la liste dependencies et la marquons comme visitée.
-
-        À la fin de l'appel de la méthode pour la tâche initiale, la liste dependencies contient les noms de toutes les
-        tâches dont la tâche initiale dépend directement ou indirectement.
-        Cette liste est ensuite retournée par la méthode get_dependencies()
-
-        :param task_name: le nom de la tâche pour laquelle on veut obtenir les dépendances
-        :param dependencies: une liste qui va contenir les noms des tâches dépendantes
-        :param visited: un ensemble pour garder une trace des tâches déjà visitées
-        :return:
-        """
-        # Vérifie si la tâche courante n'a pas été visitée précédemment pour éviter les boucles infinies
-        if task_name not in visited:
-            # Vérifie si la tâche a des dépendances
-            sub_dependencies = self.precedence.get(task_name)
-            if len(sub_dependencies) == 0:
-                # Si la tâche n'a pas de dépendance, ajoute-la à la liste de dépendances
-                dependencies.append(task_name)
-                visited.add(task_name)
-            else:
-                # Si la tâche a des dépendances, parcourt chaque dépendance et ses sous-dépendances
-                for sub_task_name in sub_dependencies:
-                    self.__r__get_dependencies(sub_task_name, dependencies, visited)
-
-                # Ajoute la tâche courante à la liste de dépendances après avoir ajouté toutes les dépendances
-                dependencies.append(task_name)
-                visited.add(task_name)
+        # Une tâche sans dépendance n'a pas besoin du parcours de sa fermeture
+        if not self._deps_mask[task_name]:
+            return []
+
+        if task_name not in self._deps_names:
+            closure = self._deps_mask[task_name] | (1 << self._task_index[task_name])
+            for name in self._topo_order:
+                if closure >> self._task_index[name] & 1 and name not in self._deps_names:
+                    # Les dépendances d'un précédent puis le précédent, sans doublon et dans l'ordre
+                    names = {}
+                    for dependent_task in self.precedence[name]:
+                        names.update(dict.fromkeys(self._deps_names[dependent_task]))
+                        names[dependent_task] = None
+                    self._deps_names[name] = tuple(names)
+        return list(self._deps_names[task_name])
 
     def run_seq(self):
         """
         Cette methode exécute toutes les tâches dans une séquence déterminée par l'ordre des dépendances.
-        Elle commence par obtenir toutes les tâches à exécuter en appelant la méthode privée __r___get_tasks_queue()
-        qui utilise une approche de parcours en profondeur pour ajouter toutes les tâches dépendantes d'une tâche à une
-        file d'attente.
-
-        Ensuite, la méthode itère sur la file d'attente et exécute chaque tâche en appelant sa méthode run().
-        Si la variable de classe LOGING est vraie, elle affiche un message indiquant quelle tâche est en cours
-        d'exécution et sur quel processus.
+        Elle parcourt l'ordre topologique self._topo_order, calculé une seule fois dans le constructeur avec
+        l'algorithme de Kahn, et exécute chaque tâche en appelant sa méthode run().
+        Si le journal 'maxpar' est actif au niveau INFO, elle indique quelle tâche est en cours d'exécution et sur
+        quel processus.
 
         En fin de compte, toutes les tâches sont exécutées dans l'ordre correct déterminé par les dépendances,
         garantissant ainsi la cohérence des données produites.
         """
+        # Le niveau du journal est testé une seule fois : aucun message n'est formaté s'il est désactivé
+        logging_enabled = log.isEnabledFor(logging.INFO)
+        for task_name in self._topo_order:
+            task = self.tasks[task_name]
+            if logging_enabled:
+                log.info('Running %s on process %6d ...', task.name, os.getpid())
+            if task.run is not None:  # Une tâche sans fonction ne fait rien
+                task.run()
 
-        # Crée un ensemble de tâches déjà visitées et une file d'attente de tâches à exécuter
-        visited = set()
-        sequence: Queue[Task] = Queue()
-
-        # Parcourt toutes les tâches pour les ajouter à la file d'attente dans l'ordre correct en respectant les dépendances
-        for task_name in self.tasks:
-            self.__r___get_tasks_queue(task_name, sequence, visited)
-
-        # Exécute toutes les tâches dans la file d'attente
-        while not sequence.empty():
-            task = sequence.get()
-            if self.LOGING:
-                print(f'[maxpar] Running {task.name} on process {os.getpid():6} ...')
-            task.run()
-
-    def __r___get_tasks_queue(self, task_name: str, sequence: Queue[Task], visited: set):
+    def run(self):
         """
-        Cette méthode utilise une approche récursive pour construire une séquence de tâches qui doivent être exécutées
-        dans un ordre spécifique pour satisfaire toutes les dépendances.
-
-        Elle commence par vérifier si la tâche a déjà été visitée, si c'est le cas, elle retourne immédiatement.
-        Sinon, elle obtient les dépendances de la tâche en appelant la méthode get_dependencies définie précédemment.
-
-        Ensuite, elle vérifie si toutes les dépendances ont déjà été visitées.
-        Si ce n'est pas le cas, elle appelle cette méthode pour chaque dépendance manquante.
-
-        Cela garantit que toutes les dépendances des tâches sont visitées avant d'ajouter la tâche elle-même à la
-        file d'attente.
+        La méthode run exécute toutes les tâches dans l'ordre en utilisant un maximum de parallélisme possible en
+        vérifiant si une tâche peut être exécutée simultanément avec d'autres tâches en cours d'exécution.
 
-        Enfin, elle ajoute la tâche visitée à la file d'attente et l'ajoute également à l'ensemble des tâches visitées.
-        :param task_name: le nom d'une tâche
-        :param sequence: une file d'attente vide qui sera remplie avec la séquence des tâches
-        :param visited: un ensemble de tâches déjà visitées
+        L'ordonnancement se fait par vagues et est piloté par les événements : chaque tâche possède un compteur de
+        précédents non encore terminés (degré entrant). Les tâches dont le compteur est nul sont prêtes ; toutes celles
+        qui n'entrent pas en conflit (lectures / écritures) avec les tâches en cours sont soumises au pool de threads,
+        par ordre décroissant de chemin critique (les tâches prêtes sont rangées dans un tas) et sans dépasser le nombre
+        de threads du pool, puis l'ordonnanceur
+        attend avec concurrent.futures.wait qu'au moins une tâche se termine avant de réexaminer les tâches prêtes.
+        Aucune tâche n'est remise en queue et aucune attente active n'est effectuée.
 
+        Si une tâche lève une exception, l'ordonnanceur attend la fin des tâches en cours puis propage l'exception.
         """
-        # Vérifie si la tâche a déjà été visitée et quitte la méthode si c'est le cas
-        if task_name in visited:
-            return
-        # Obtient les dépendances de la tâche
-        dependencies = self.get_dependencies(task_name)
-        # Vérifie si toutes les dépendances ont déjà été visitées
-        if not (len(dependencies) == 0 or all(dependency in visited for dependency in dependencies)):
-            # Si ce n'est pas le cas, on appelle récursivement cette méthode pour chaque dépendance
-            for dependency in dependencies:
-                self.__r___get_tasks_queue(dependency, sequence, visited)
+        # Références locales vers les données précalculées dans le constructeur, le graphe étant figé
+        tasks = self.tasks
+        reads = self._reads_mask
+        writes = self._writes_mask
+        successors = self._reduced_successors
+        critical_path = self._critical_path
+        task_index = self._task_index
+        submit = self.__get_pool().submit
+        max_workers = self._max_workers
+        run_task = self.__run_task
+
+        # Nombre de précédents non encore terminés de chaque tâche, à partir des valeurs précalculées
+        indegree = self._indegree.copy()
+
+        # Tas des tâches prêtes, ordonné par chemin critique décroissant puis par indice de tâche en cas d'égalité
+        ready = [(-critical_path[task_name], task_index[task_name], task_name) for task_name in self._roots]
+        heapq.heapify(ready)
+        futures = {}  # Tâches en cours d'exécution : Future -> nom de la tâche
+        active_reads = 0  # Union des variables lues par les tâches en cours
+        active_writes = 0  # Union des variables écrites par les tâches en cours
+        remaining = len(self.tasks)
+        while remaining:
+            # Lancer les tâches prêtes qui n'entrent pas en conflit avec les tâches en cours, dans la limite des threads
+            # libres : les autres restent dans le tas et seront choisies par priorité à la prochaine fin de tâche
+            blocked = []
+            while ready and len(futures) < max_workers:
+                item = heapq.heappop(ready)
+                _, _, task_name = item
+                reads_mask = reads[task_name]
+                writes_mask = writes[task_name]
+                # Conditions de Bernstein : pas de conflit lecture/écriture, écriture/lecture ni écriture/écriture
+                if reads_mask & active_writes | writes_mask & (active_reads | active_writes):
+                    blocked.append(item)
+                    continue
+                futures[submit(run_task, tasks[task_name])] = task_name
+                active_reads |= reads_mask
+                active_writes |= writes_mask
+            # Remettre les tâches bloquées dans le tas
+            if blocked:
+                ready.extend(blocked)
+                heapq.heapify(ready)
+
+            # Attendre la fin d'au moins une tâche
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                task_name = futures.pop(future)
+                if future.exception() is not None:
+                    # Annuler les tâches soumises mais pas encore démarrées, puis attendre celles en cours
+                    for pending in futures:
+                        pending.cancel()
+                    wait(futures)
+                    raise future.exception()
+                remaining -= 1
+                # Les successeurs dont tous les précédents sont terminés deviennent prêts
+                for child in successors[task_name]:
+                    indegree[child] -= 1
+                    if indegree[child] == 0:
+                        heapq.heappush(ready, (-critical_path[child], task_index[child], child))
+
+            # Recalculer les variables utilisées par les tâches encore en cours
+            active_reads = 0
+            active_writes = 0
+            for task_name in futures.values():
+                active_reads |= reads[task_name]
+                active_writes |= writes[task_name]
+
+    def __run_task(self, task: Task):
+        # Exécutée par un thread du pool : journalise le thread utilisé puis exécute la tâche
+        log.info('Running %s on process %6d ...', task.name, threading.get_native_id())
+        if task.run is not None:  # Une tâche sans fonction ne fait rien
+            task.run()
 
-        # Obtient la tâche correspondant au nom de la tâche et l'ajoute à la file d'attente
-        task = self.tasks.get(task_name)
-        sequence.put(task)
-        # Marque la tâche comme visitée
-        visited.add(task_name)
+    def __get_pool(self) -> ThreadPoolExecutor:
+        # Crée le pool de threads à la première utilisation puis le réutilise pour les exécutions suivantes
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='maxpar')
+        return self._pool
 
-    def run(self):
+    def close(self):
         """
-        La méthode run exécute toutes les tâches dans l'ordre en utilisant un maximum de parallélisme possible en
-        vérifiant si une tâche peut être exécutée simultanément avec d'autres tâches en cours d'exécution.
-        Pour cela, elle utilise des threads et des queues pour gérer l'ordre d'exécution des tâches.
-        La méthode vérifie également si une tâche peut être exécutée en se basant sur ses dépendances et ses lectures
-        et écritures pour éviter les conflits d'accès aux données partagées entre les threads.
+        Arrête le pool de threads utilisé par run(). Le système de tâches reste utilisable : un nouveau pool sera créé
+        au prochain appel à run().
         """
-        visited = set()
-        queue: Queue[Task] = Queue()
-        # Récupérer toutes les tâches dans l'ordre
-        for task_name in self.tasks:
-            self.__r___get_tasks_queue(task_name, queue, visited)
-
-        # Exécuter toutes les tâches dans la queue en utilisant une parallélisation maximale
-
-        # Initialiser une liste pour suivre les processus en cours d'exécution
-        processes = {}
-        executed = set()
-        # Boucler sur les tâches dans la queue
-        while not queue.empty():
-            # Obtenir la prochaine tâche de la queue
-            task = queue.get()
-
-            # Vérifier si la tâche peut être exécutée simultanément avec l'un des processus en cours d'exécution
-            can_run_simultaneously = True
-            for p in processes:
-                if set(task.reads) & set(processes[p].writes) or set(task.writes) & set(processes[p].reads):
-                    # La tâche partage des lectures ou des écritures avec un processus en cours d'exécution, ne peut pas être exécutée simultanément
-                    can_run_simultaneously = False
-                    break
-
-            if not set(self.get_dependencies(task.name)).issubset(executed):
-                can_run_simultaneously = False
-
-            if can_run_simultaneously:
-                # Créer un nouveau processus pour exécuter la tâche
-                p = threading.Thread(target=task.run)
-                p.start()
-                if self.LOGING:
-                    print(f'[maxpar] Running {task.name} on process {p.native_id:6} ...')
-                processes[p] = task
-            else:
-                # Remettre la tâche à la fin de la queue
-                queue.put(task)
-
-            # Attendre que les processus terminés soient terminés et les supprimer de la liste
-            for p in processes.copy():
-                if not p.is_alive():
-                    task_done = processes.pop(p)
-                    executed.add(task_done.name)
-        # Attendre que tous les processus restants soient terminés
-        for p in processes:
-            p.join()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def __del__(self):
+        # Le constructeur peut avoir échoué avant la création de l'attribut _pool
+        if getattr(self, '_pool', None) is not None:
+            self._pool.shutdown(wait=False)
 
     def par_cost(self):
         """
@@ -340,6 +430,10 @@ class TaskSystem:
         """
         Visualise l'arbre d'exécution des tâches du système
         """
+        # Imports locaux : matplotlib et networkx sont longs à importer et ne servent qu'à la visualisation
+        import matplotlib.pyplot as plt
+        import networkx as nx
+
         # Créer un graphe dirigé
         graph = nx.DiGraph()
 
@@ -368,6 +462,3 @@ class TaskSystem:
             width=2
         )
         plt.show()
-
-    def set_logging(self, state: bool):
-        self.LOGING = state
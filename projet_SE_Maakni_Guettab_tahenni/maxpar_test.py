@@ -1,4 +1,5 @@
 import random
+import threading
 import time
 import unittest
 
@@ -74,6 +75,13 @@ class TestTaskSystem(unittest.TestCase):
         with self.assertRaises(TaskNotFoundError):
             TaskSystem(self.tasks[:-1], self.precedence)
 
+    def test_unknown_dependency_exception(self):
+        """Should raise TaskNotFoundError when a precedence refers to an unknown task"""
+        precedence = self.precedence.copy()
+        precedence['T3'] = ['T1', 'unknown_task']
+        with self.assertRaises(TaskNotFoundError):
+            TaskSystem(self.tasks, precedence)
+
     def test_duplicate_task_exception(self):
         """Should raise DuplicateTaskError"""
         with self.assertRaises(DuplicateTaskError):
@@ -103,6 +111,21 @@ class TestTaskSystem(unittest.TestCase):
         with self.assertRaises(InvalidPrecedenceDictError):
             TaskSystem(self.tasks, precedence)
 
+    def test_transitive_reduction(self):
+        """Should drop redundant precedence edges for scheduling only"""
+        precedence = self.precedence.copy()
+        precedence['T5'] = ['T1', 'T2', 'T3', 'T4']
+        precedence['T6'] = ['T5', 'T3', 'T5']
+        ts = TaskSystem(self.tasks, precedence)
+        self.addCleanup(ts.close)
+
+        self.assertDictEqual(ts.precedence, precedence)
+        self.assertListEqual(ts._reduced_precedence['T5'], ['T3', 'T4'])
+        self.assertListEqual(ts._reduced_precedence['T6'], ['T5'])
+
+        ts.run()
+        self.assertEqual(Z, 49)
+
     def test_get_dependencies(self):
         """Should get dependencies of a Task properly"""
         ts = TaskSystem(self.tasks, self.precedence)
@@ -114,6 +137,15 @@ class TestTaskSystem(unittest.TestCase):
         self.assertListEqual(ts.get_dependencies('T5'), ['T1', 'T2', 'T3', 'T4'])
         self.assertListEqual(ts.get_dependencies('T6'), ['T1', 'T2', 'T3', 'T4', 'T5'])
 
+    def test_get_dependencies_of_long_chain(self):
+        """Should handle precedence chains deeper than the recursion limit"""
+        size = 3000
+        tasks = [Task(name=f'C{i}', reads=[], writes=[]) for i in range(size)]
+        precedence = {f'C{i}': [f'C{i - 1}'] if i else [] for i in range(size)}
+        ts = TaskSystem(tasks, precedence)
+
+        self.assertListEqual(ts.get_dependencies(f'C{size - 1}'), [f'C{i}' for i in range(size - 1)])
+
     def test_get_dependencies_of_unknown_task(self):
         """Should raise TaskNotFoundError"""
         ts = TaskSystem(self.tasks, self.precedence)
@@ -124,16 +156,140 @@ class TestTaskSystem(unittest.TestCase):
     def test_run_seq(self):
         """Should run the task system properly"""
         ts = TaskSystem(self.tasks, self.precedence)
-        ts.set_logging(False)
         ts.run_seq()
 
         self.assertEqual(Z, 49)
 
+    def test_run_seq_logging(self):
+        """Should log every task run on the maxpar logger"""
+        ts = TaskSystem(self.tasks, self.precedence)
+        with self.assertLogs('maxpar', level='INFO') as logs:
+            ts.run_seq()
+
+        self.assertEqual(len(logs.records), len(self.tasks))
+        self.assertEqual(Z, 49)
+
     def test_run(self):
         """Should run the task system using maximum parallelism properly"""
         ts = TaskSystem(self.tasks, self.precedence)
-        ts.set_logging(False)
+        self.addCleanup(ts.close)
+        ts.run()
+
+        self.assertEqual(Z, 49)
+
+    def test_run_tasks_without_function(self):
+        """Should run tasks that have no function as no-ops in both modes"""
+        executed = []
+        tasks = [
+            Task(name='A', reads=[], writes=['A']),
+            Task(name='B', reads=['A'], writes=['B']),
+            Task(name='C', reads=['B'], writes=[], run=lambda: executed.append('C')),
+        ]
+        ts = TaskSystem(tasks, {'A': [], 'B': ['A'], 'C': ['B']})
+        self.addCleanup(ts.close)
+        ts.run_seq()
+        self.assertListEqual(executed, ['C'])
+
+        ts.run()
+        self.assertListEqual(executed, ['C', 'C'])
+
+    def test_run_propagates_task_exception(self):
+        """Should wait for running tasks, skip waiting ones, then raise the exception of a failed task"""
+        finished = []
+        started = threading.Event()
+
+        def fail():
+            started.wait(timeout=1)  # Échoue une fois que B est en cours d'exécution
+            raise ValueError('task failed')
+
+        def slow():
+            started.set()
+            time.sleep(0.2)
+            finished.append('B')
+
+        tasks = [
+            Task(name='A', reads=[], writes=['A'], run=fail),
+            Task(name='B', reads=[], writes=['B'], run=slow),
+            *(Task(name=name, reads=[], writes=[name], run=lambda name=name: finished.append(name))
+              for name in ('B0', 'B1', 'B2')),
+        ]
+        ts = TaskSystem(tasks, {task.name: [] for task in tasks}, max_workers=2)
+        self.addCleanup(ts.close)
+        with self.assertRaises(ValueError):
+            ts.run()
+
+        self.assertListEqual(finished, ['B'])
+
+    def test_run_write_write_conflict(self):
+        """Should not run simultaneously two independent tasks writing the same variable"""
+        intervals = []
+
+        def write_w():
+            start = time.perf_counter()
+            time.sleep(0.05)
+            intervals.append((start, time.perf_counter()))
+
+        tasks = [
+            Task(name='A', reads=[], writes=['W'], run=write_w),
+            Task(name='B', reads=[], writes=['W'], run=write_w),
+        ]
+        ts = TaskSystem(tasks, {'A': [], 'B': []})
+        self.addCleanup(ts.close)
+        ts.run()
+
+        (start_a, end_a), (start_b, end_b) = sorted(intervals)
+        self.assertGreaterEqual(start_b, end_a)
+
+    def test_run_launches_ready_tasks_together(self):
+        """Should start every independent ready task before waiting for any of them"""
+        barrier = threading.Barrier(3, timeout=1)
+        tasks = [Task(name=name, reads=[], writes=[name], run=barrier.wait) for name in ('A', 'B', 'C')]
+        ts = TaskSystem(tasks, {'A': [], 'B': [], 'C': []})
+        self.addCleanup(ts.close)
+        ts.run()
+
+        self.assertFalse(barrier.broken)
+
+    def test_run_critical_path_first(self):
+        """Should start the ready task with the longest critical path first"""
+        order = []
+        tasks = [
+            Task(name='A', reads=[], writes=['A'], run=lambda: order.append('A')),
+            Task(name='B', reads=[], writes=['B'], run=lambda: order.append('B')),
+            Task(name='C', reads=[], writes=['C'], run=lambda: order.append('C'), cost=5),
+        ]
+        ts = TaskSystem(tasks, {'A': [], 'B': [], 'C': ['B']}, max_workers=1)
+        self.addCleanup(ts.close)
+        ts.run()
+
+        # C devient prête après B et passe avant A, dont le chemin critique est plus court
+        self.assertListEqual(order, ['B', 'C', 'A'])
+
+    def test_run_critical_path_when_pool_is_full(self):
+        """Should start a critical task that becomes ready before less critical tasks waiting for a thread"""
+        order = []
+
+        def record(name):
+            return lambda: order.append(name)
+
+        names = ['S0', 'F0', 'F1', 'F2', 'F3']
+        tasks = [Task(name=name, reads=[], writes=[name], run=record(name)) for name in names]
+        tasks.append(Task(name='L', reads=[], writes=['L'], run=record('L'), cost=100))
+        precedence = {name: [] for name in names}
+        precedence['L'] = ['S0']
+        ts = TaskSystem(tasks, precedence, max_workers=1)
+        self.addCleanup(ts.close)
+        ts.run()
+
+        self.assertListEqual(order, ['S0', 'L', 'F0', 'F1', 'F2', 'F3'])
+
+    def test_close(self):
+        """Should shut down the thread pool and create a new one on the next run"""
+        ts = TaskSystem(self.tasks, self.precedence)
+        ts.run()
+        ts.close()
         ts.run()
+        ts.close()
 
         self.assertEqual(Z, 49)
 